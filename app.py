@@ -5,12 +5,11 @@ load_dotenv()
 from typing import Tuple
 import datetime as dt
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 import pandas as pd
 import gradio as gr
 
-from backtest import run_backtest
+from backtest import run_backtest, validate_strategy_config
+from backtest.data import COMPACT_HISTORY_CALENDAR_DAYS, has_cached_full_history, needs_full_history
 from llm_strategy import llm_generate_strategy_config
 
 
@@ -19,6 +18,10 @@ default_end = today
 default_start = today - dt.timedelta(days=90)
 
 
+def _empty_equity_frame() -> pd.DataFrame:
+    return pd.DataFrame({"date": pd.to_datetime([]), "equity": []})
+
+
 def backtest_interface(
     symbol: str,
     start_date: str,
@@ -31,80 +34,64 @@ def backtest_interface(
     dca_interval_days: int,
     dca_amount: float,
     initial_cash: float,
-) -> Tuple[str, str, plt.Figure]:
+) -> Tuple[str, str, pd.DataFrame]:
     # ---------------- 日期校验 ----------------
     try:
         start_dt = pd.to_datetime(start_date)
         end_dt = pd.to_datetime(end_date)
-        max_days_ago = today - dt.timedelta(days=100)
-
-        if start_dt.date() < max_days_ago:
-            return (
-                f"Error: Start date cannot be more than 100 days ago.\n"
-                f"AlphaVantage free API only provides ~100 trading days of data.\n"
-                f"Please use a start date after {max_days_ago.strftime('%Y-%m-%d')}",
-                "",
-                plt.figure(),
-            )
 
         if start_dt > end_dt:
-            return ("Error: Start date must be before end date.", "", plt.figure())
+            return ("Error: Start date must be before end date.", "", _empty_equity_frame())
     except Exception as e:
-        return (f"Error: Invalid date format. Please use YYYY-MM-DD.\n{e}", "", plt.figure())
+        return (f"Error: Invalid date format. Please use YYYY-MM-DD.\n{e}", "", _empty_equity_frame())
 
     symbol = symbol.strip()
     if not symbol:
-        return ("Error: Stock symbol cannot be empty.", "", plt.figure())
+        return ("Error: Stock symbol cannot be empty.", "", _empty_equity_frame())
+
+    # Older start dates need the premium full history; reject them locally
+    # (no API request spent) unless a full history is already cached today.
+    if needs_full_history(start_date) and not has_cached_full_history(symbol):
+        min_start = dt.date.today() - dt.timedelta(days=COMPACT_HISTORY_CALENDAR_DAYS)
+        return (
+            f"Error: Start date cannot be more than {COMPACT_HISTORY_CALENDAR_DAYS} days ago.\n"
+            f"AlphaVantage free API only provides ~100 trading days of data.\n"
+            f"Please use a start date after {min_start.strftime('%Y-%m-%d')}",
+            "",
+            _empty_equity_frame(),
+        )
 
     if initial_cash is None or initial_cash <= 0:
-        return ("Error: Initial cash must be a positive number.", "", plt.figure())
+        return ("Error: Initial cash must be a positive number.", "", _empty_equity_frame())
 
     # ---------------- LLM / Manual 分支 ----------------
     use_llm = (mode == "LLM")
 
     if use_llm:
         if not strategy_description.strip():
-            return ("Error: Please enter a strategy description.", "", plt.figure())
+            return ("Error: Please enter a strategy description.", "", _empty_equity_frame())
         try:
-            strategy_config = llm_generate_strategy_config(strategy_description.strip())
+            strategy_config = llm_generate_strategy_config(strategy_description)
             # Use initial_cash from LLM if provided, otherwise use UI value
             if "initial_cash" in strategy_config:
                 initial_cash = float(strategy_config.pop("initial_cash"))
         except Exception as e:
-            return (f"LLM strategy parsing failed:\n{e}", "", plt.figure())
+            return (f"LLM strategy parsing failed:\n{e}", "", _empty_equity_frame())
     else:
         # Manual 模式
-        if strategy_type == "ma_cross":
-            if short_window <= 0 or long_window <= 0:
-                return ("Error: MA windows must be > 0.", "", plt.figure())
-            if short_window >= long_window:
-                return ("Error: Short MA window must be < long MA window.", "", plt.figure())
-            strategy_config = {
-                "type": "ma_cross",
-                "params": {
-                    "short_window": int(short_window),
-                    "long_window": int(long_window),
-                },
-            }
-        elif strategy_type == "dca":
-            if dca_interval_days <= 0:
-                return ("Error: DCA interval days must be > 0.", "", plt.figure())
-            if dca_amount <= 0:
-                return ("Error: DCA amount must be > 0.", "", plt.figure())
-            strategy_config = {
-                "type": "dca",
-                "params": {
-                    "interval_days": int(dca_interval_days),
-                    "buy_amount": float(dca_amount),
-                },
-            }
-        elif strategy_type == "buy_and_hold":
-            strategy_config = {
-                "type": "buy_and_hold",
-                "params": {"buy_fraction": 1.0},
-            }
-        else:
-            return (f"Unsupported strategy type: {strategy_type}", "", plt.figure())
+        manual_params = {
+            "ma_cross": {"short_window": short_window, "long_window": long_window},
+            "dca": {"interval_days": dca_interval_days, "buy_amount": dca_amount},
+            "buy_and_hold": {"buy_fraction": 1.0},
+        }
+        if strategy_type not in manual_params:
+            return (f"Unsupported strategy type: {strategy_type}", "", _empty_equity_frame())
+        try:
+            strategy_config = validate_strategy_config(
+                {"type": strategy_type, "params": manual_params[strategy_type]}
+            )
+        except ValueError as e:
+            return (f"Error: Invalid strategy parameters.\n{e}", "", _empty_equity_frame())
 
     # ---------------- 回测 ----------------
     try:
@@ -116,11 +103,11 @@ def backtest_interface(
             initial_cash=float(initial_cash),
         )
     except Exception as e:
-        return (f"Backtest failed: {e}", "", plt.figure())
+        return (f"Backtest failed: {e}", "", _empty_equity_frame())
 
     metrics = result["metrics"]
     trades = result["trades"]
-    equity_curve = result["equity_curve"]
+    equity_columns = result["equity_curve"]
 
     metrics_text = (
         f"Symbol: {result['symbol']}\n"
@@ -148,41 +135,16 @@ def backtest_interface(
     else:
         trades_text = "No trades (strategy generated no signals)"
 
-    if not equity_curve:
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.text(0.5, 0.5, "No equity curve data available", ha="center", va="center", transform=ax.transAxes)
-        ax.set_title(f"Equity Curve - {result['symbol']}")
-        return metrics_text, trades_text, fig
-
-    dates = [pd.to_datetime(p["date"]) for p in equity_curve]
-    equity = [p["equity"] for p in equity_curve]
-
-    plt.close("all")
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.plot(dates, equity, linewidth=1.5)
-    ax.set_title(f"Equity Curve - {result['symbol']}")
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Equity")
-    ax.grid(True, alpha=0.3)
-
-    start_dt = pd.to_datetime(result["start_date"])
-    end_dt = pd.to_datetime(result["end_date"])
-    ax.set_xlim([start_dt, end_dt])
-
-    date_range = (end_dt - start_dt).days
-    if date_range <= 30:
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%m-%d"))
-        ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, date_range // 10)))
-    elif date_range <= 365:
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
-        ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=2))
-    else:
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=max(1, date_range // 365)))
+    if not equity_columns["date"]:
+        return metrics_text, trades_text, _empty_equity_frame()
 
-    fig.autofmt_xdate(rotation=45)
+    # Rendered client-side by gr.LinePlot, so only the data is shipped
+    ec = pd.DataFrame({
+        "date": pd.to_datetime(equity_columns["date"], format="%Y-%m-%d"),
+        "equity": equity_columns["equity"],
+    })
 
-    return metrics_text, trades_text, fig
+    return metrics_text, trades_text, ec
 
 
 with gr.Blocks(title="LLM-Powered Strategy Backtesting") as demo:
@@ -238,7 +200,13 @@ with gr.Blocks(title="LLM-Powered Strategy Backtesting") as demo:
         with gr.Column():
             metrics_out = gr.Textbox(label="Backtest Metrics", lines=14)
             trades_out = gr.Textbox(label="Trade Summary", lines=14)
-            equity_plot = gr.Plot(label="Equity Curve")
+            equity_plot = gr.LinePlot(
+                x="date",
+                y="equity",
+                label="Equity Curve",
+                x_title="Date",
+                y_title="Equity",
+            )
 
     run_btn.click(
         backtest_interface,
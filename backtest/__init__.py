@@ -1,5 +1,15 @@
 # backtest/__init__.py
 
-from .engine import run_backtest, run_backtest_for_symbol
+from .config import validate_strategy_config
+from .engine import run_backtest, run_backtest_for_symbol, run_backtests
+from .parallel import run_many
+from .strategies import equity_curve_aos
 
-__all__ = ["run_backtest", "run_backtest_for_symbol"]
+__all__ = [
+    "equity_curve_aos",
+    "run_backtest",
+    "run_backtest_for_symbol",
+    "run_backtests",
+    "run_many",
+    "validate_strategy_config",
+]
@@ -0,0 +1,180 @@
+# backtest/_kernels.py
+
+import numpy as np
+from numba import njit, types
+
+
+# Explicit signatures compile the kernels eagerly at import (or load them
+# from the on-disk cache), so no backtest call pays the JIT cost. Arrays
+# must be contiguous; callers pass np.ascontiguousarray(...). Column views
+# handed out by pandas are often read-only, so inputs accept both.
+_F8 = types.float64[::1]
+_F8_RO = types.Array(types.float64, 1, "C", readonly=True)
+_I8 = types.int64[::1]
+_B1 = types.boolean[::1]
+
+
+@njit([_F8(_F8, types.int64), _F8(_F8_RO, types.int64)], cache=True, nogil=True)
+def move_mean(arr, window):
+    """
+    Trailing moving average over `window` values in O(n): one add and one
+    subtract per bar (Kahan-compensated). The first window-1 values are NaN,
+    matching pandas rolling(window).mean().
+    """
+    n = arr.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    running = 0.0
+    comp = 0.0
+
+    for i in range(n):
+        y = arr[i] - comp
+        t = running + y
+        comp = (t - running) - y
+        running = t
+        if i >= window:
+            y = -arr[i - window] - comp
+            t = running + y
+            comp = (t - running) - y
+            running = t
+        if i >= window - 1:
+            out[i] = running / window
+        else:
+            out[i] = np.nan
+
+    return out
+
+
+@njit(
+    [
+        types.Tuple((_F8, _I8, _I8, _I8))(close_t, _B1, types.float64, types.int64)
+        for close_t in (_F8, _F8_RO)
+    ],
+    cache=True,
+    nogil=True,
+)
+def ma_cross_kernel(close, position, initial_cash, start):
+    """
+    Bar-by-bar long-only accounting for a 0/1 position signal.
+    Buys whole (int64) shares with all cash when position turns on, sells
+    everything when it turns off. position must be off before `start` (the
+    MA warm-up); those bars are filled with initial_cash without looping.
+    Returns (equity, entry_idx, exit_idx, trade_shares) where the last three
+    describe completed round trips.
+    """
+    n = close.shape[0]
+    equity = np.empty(n, dtype=np.float64)
+
+    max_trades = n // 2 + 1
+    entry_idx = np.empty(max_trades, dtype=np.int64)
+    exit_idx = np.empty(max_trades, dtype=np.int64)
+    trade_shares = np.empty(max_trades, dtype=np.int64)
+    n_trades = 0
+
+    cash = initial_cash
+    shares = 0
+    holding = False
+    entry = -1
+
+    start = min(max(start, 0), n)
+    equity[:start] = initial_cash
+    for i in range(start, n):
+        price = close[i]
+        if position[i] and not holding:
+            if cash > 0:
+                shares = np.int64(cash // price)
+                cash -= shares * price
+                entry = i
+            holding = True
+        elif holding and not position[i]:
+            if shares > 0:
+                cash += shares * price
+                if entry >= 0:
+                    entry_idx[n_trades] = entry
+                    exit_idx[n_trades] = i
+                    trade_shares[n_trades] = shares
+                    n_trades += 1
+                shares = 0
+                entry = -1
+            holding = False
+        equity[i] = cash + shares * price
+
+    return equity, entry_idx[:n_trades], exit_idx[:n_trades], trade_shares[:n_trades]
+
+
+@njit(
+    [types.UniTuple(types.float64, 3)(eq_t) for eq_t in (_F8, _F8_RO)],
+    cache=True,
+    nogil=True,
+    error_model="numpy",
+)
+def metrics_kernel(equity):
+    """
+    Single pass over the equity curve.
+    Returns (total_return, annualized_return, max_drawdown) with the same
+    conventions as metrics.py: 252 trading days per year, zero returns when
+    the curve starts at 0, and drawdown bars where the peak is 0 skipped.
+    """
+    n = equity.shape[0]
+    if n == 0:
+        return 0.0, 0.0, 0.0
+
+    running_max = equity[0]
+    min_dd = np.nan
+    for i in range(n):
+        e = equity[i]
+        if e > running_max:
+            running_max = e
+        dd = (e - running_max) / running_max
+        if dd < min_dd or (min_dd != min_dd and dd == dd):
+            min_dd = dd
+
+    first = equity[0]
+    if first == 0:
+        total_return = 0.0
+        ann_ret = 0.0
+    else:
+        total_return = equity[n - 1] / first - 1.0
+        if n <= 1:
+            ann_ret = total_return
+        else:
+            ann_ret = (1.0 + total_return) ** (252.0 / n) - 1.0
+
+    return total_return, ann_ret, abs(min_dd)
+
+
+@njit(
+    [
+        types.Tuple((_F8, _I8, _F8))(close_t, _I8, types.int64, types.float64, types.float64)
+        for close_t in (_F8, _F8_RO)
+    ],
+    cache=True,
+    nogil=True,
+)
+def dca_kernel(close, days, interval_days, buy_amount, initial_cash):
+    """
+    Calendar-scheduled DCA accounting. `days` are day ordinals (datetime64[D]
+    as int64). Buys buy_amount of new funds' worth of shares on the first
+    bar with a positive price, then on the first such bar at least
+    interval_days after the previous buy; cash stays at initial_cash.
+    Returns (equity, buy_idx, buy_shares).
+    """
+    n = close.shape[0]
+    equity = np.empty(n, dtype=np.float64)
+    buy_idx = np.empty(n, dtype=np.int64)
+    buy_shares = np.empty(n, dtype=np.float64)
+    n_buys = 0
+
+    shares = 0.0
+    next_day = days[0] if n > 0 else 0
+    for i in range(n):
+        price = close[i]
+        if price > 0 and (n_buys == 0 or days[i] >= next_day):
+            bought = buy_amount / price
+            shares += bought
+            buy_idx[n_buys] = i
+            buy_shares[n_buys] = bought
+            n_buys += 1
+            next_day = days[i] + interval_days
+        equity[i] = initial_cash + shares * price
+
+    return equity, buy_idx[:n_buys], buy_shares[:n_buys]
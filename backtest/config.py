@@ -0,0 +1,71 @@
+# backtest/config.py
+
+from typing import Any, Dict, Literal, Union
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, model_validator
+from pydantic_core import PydanticCustomError
+from typing_extensions import Annotated
+
+
+class MaCrossParams(BaseModel):
+    short_window: int = Field(20, gt=0)
+    long_window: int = Field(60, gt=0)
+
+    @model_validator(mode="after")
+    def _check_window_order(self) -> "MaCrossParams":
+        if self.short_window >= self.long_window:
+            raise PydanticCustomError(
+                "window_order", "short_window must be less than long_window"
+            )
+        return self
+
+
+class DcaParams(BaseModel):
+    interval_days: int = Field(7, gt=0)
+    buy_amount: float = Field(1000.0, gt=0)
+
+
+class BuyAndHoldParams(BaseModel):
+    buy_fraction: float = Field(1.0, gt=0, le=1)
+
+
+class MaCrossConfig(BaseModel):
+    type: Literal["ma_cross"]
+    params: MaCrossParams = Field(default_factory=MaCrossParams)
+
+
+class DcaConfig(BaseModel):
+    type: Literal["dca"]
+    params: DcaParams = Field(default_factory=DcaParams)
+
+
+class BuyAndHoldConfig(BaseModel):
+    type: Literal["buy_and_hold"]
+    params: BuyAndHoldParams = Field(default_factory=BuyAndHoldParams)
+
+
+StrategyConfig = Annotated[
+    Union[MaCrossConfig, DcaConfig, BuyAndHoldConfig],
+    Field(discriminator="type"),
+]
+
+# Built once at import; validation then runs entirely in pydantic-core
+_STRATEGY_CONFIG_ADAPTER: TypeAdapter = TypeAdapter(StrategyConfig)
+
+
+def validate_strategy_config(strategy_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a strategy_config dict and return it normalized (ints/floats
+    coerced, missing params filled with strategy defaults).
+    Raises ValueError with one "field: message" line per problem.
+    """
+    try:
+        cfg = _STRATEGY_CONFIG_ADAPTER.validate_python(strategy_config)
+    except ValidationError as e:
+        # loc starts with the discriminator tag, e.g. ("ma_cross", "params", "short_window")
+        lines = []
+        for err in e.errors():
+            field = ".".join(str(p) for p in err["loc"][1:]) or "type"
+            lines.append(f"{field}: {err['msg']}")
+        raise ValueError("\n".join(lines)) from None
+    return cfg.model_dump()
@@ -1,43 +1,116 @@
 # backtest/data.py
 
+import asyncio
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
-from typing import Any
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+import diskcache
+import orjson
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+if TYPE_CHECKING:
+    import aiohttp
 
 
 ALPHAVANTAGE_API_KEY = os.getenv("ALPHAVANTAGE_API_KEY", "")
+ALPHAVANTAGE_URL = "https://www.alphavantage.co/query"
 
+# Free tier allows 5 requests per minute, so batched fetches never exceed this
+MAX_CONCURRENT_REQUESTS = 5
 
-def fetch_price_history(
-    symbol: str,
-    start_date: str,
-    end_date: str,
-) -> pd.DataFrame:
-    """
-    Fetch daily historical data from AlphaVantage (free TIME_SERIES_DAILY + compact).
-    Returns DataFrame with columns: date, open, high, low, close, volume
-    Sorted by date and filtered by start_date/end_date.
-    """
+# outputsize=compact returns the last 100 trading days, i.e. at least the last
+# ~140 calendar days; older start dates need the full history (premium).
+COMPACT_HISTORY_DAYS = 100
+COMPACT_HISTORY_CALENDAR_DAYS = 140
+
+# Parsed price frames keyed by (symbol, outputsize, day); the daily series only
+# changes once per trading day, so repeated runs skip the network entirely.
+# Frames (not the raw JSON) are stored so hits never rebuild the nested dict.
+CACHE_EXPIRE_SECONDS = 86400
+_CACHE = diskcache.Cache(os.path.expanduser("~/.cache/av"))
+
+# Reused keep-alive session so repeat requests skip the TCP/TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
+
+_PRICE_COLUMNS = {
+    "1. open": "open",
+    "2. high": "high",
+    "3. low": "low",
+    "4. close": "close",
+    "5. volume": "volume",
+}
+
+
+def _check_api_key() -> None:
     if not ALPHAVANTAGE_API_KEY:
         raise ValueError("Missing AlphaVantage API Key. Set ALPHAVANTAGE_API_KEY environment variable.")
 
-    url = "https://www.alphavantage.co/query"
-    params: dict[str, Any] = {
+
+def _output_size(start_date: str) -> str:
+    start = pd.to_datetime(start_date).date()
+    return "full" if (dt.date.today() - start).days > COMPACT_HISTORY_CALENDAR_DAYS else "compact"
+
+
+def needs_full_history(start_date: str) -> bool:
+    """True if start_date is older than what outputsize=compact covers."""
+    return _output_size(start_date) == "full"
+
+
+def has_cached_full_history(symbol: str) -> bool:
+    """True if today's full price history for symbol is already in the disk cache."""
+    return _cached_prices(symbol.upper(), "full", dt.date.today().isoformat()) is not None
+
+
+def _cache_key(symbol: str, output_size: str, day: str) -> str:
+    return f"prices:{symbol.upper()}:{output_size}:{day}"
+
+
+def _cached_prices(symbol: str, output_size: str, day: str) -> Optional[pd.DataFrame]:
+    # A cached full history also covers any compact request
+    sizes = ("compact", "full") if output_size == "compact" else ("full",)
+    for size in sizes:
+        prices = _CACHE.get(_cache_key(symbol, size, day))
+        if prices is not None:
+            return prices
+    return None
+
+
+def _query_params(symbol: str, output_size: str) -> Dict[str, Any]:
+    return {
         "function": "TIME_SERIES_DAILY",
         "symbol": symbol,
         "apikey": ALPHAVANTAGE_API_KEY,
-        "outputsize": "compact",
+        "outputsize": output_size,
         "datatype": "json",
     }
 
-    resp = requests.get(url, params=params, timeout=15)
-    if resp.status_code != 200:
-        raise ValueError(f"AlphaVantage request failed with HTTP status: {resp.status_code}")
-
-    data = resp.json()
 
+def _parse_payload(data: Dict[str, Any], output_size: str) -> pd.DataFrame:
+    """
+    Validate an AlphaVantage payload and convert it into a float64 price
+    DataFrame indexed by date, sorted ascending.
+    Error payloads (rate limit, bad symbol, ...) raise ValueError; output_size
+    is the outputsize the payload was requested with.
+    """
     if "Time Series (Daily)" not in data:
         # Get error message and sanitize it to remove API key
         raw_msg = (
@@ -46,13 +119,13 @@ def fetch_price_history(
             or data.get("Information")
             or str(data)
         )
-        
+
         # Remove API key from error message if present
         if ALPHAVANTAGE_API_KEY and ALPHAVANTAGE_API_KEY in raw_msg:
             msg = raw_msg.replace(ALPHAVANTAGE_API_KEY, "[API_KEY_HIDDEN]")
         else:
             msg = raw_msg
-        
+
         # Check for common error types and provide user-friendly messages
         if "rate limit" in msg.lower() or "25 requests per day" in msg.lower():
             raise ValueError(
@@ -67,41 +140,145 @@ def fetch_price_history(
                 "Free tier allows 25 requests per day. "
                 "Please try again later or upgrade to a premium plan."
             )
+        elif output_size == "full" and "premium" in msg.lower():
+            raise ValueError(
+                f"Start dates more than {COMPACT_HISTORY_CALENDAR_DAYS} days ago need the full price history, "
+                "which requires an AlphaVantage premium plan. "
+                f"Free tier only covers about the last {COMPACT_HISTORY_DAYS} trading days."
+            )
         else:
             # Generic error without exposing API key
             raise ValueError(f"AlphaVantage API error: {msg}")
 
     ts = data["Time Series (Daily)"]
 
-    records = []
-    for date_str, daily in ts.items():
-        try:
-            records.append(
-                {
-                    "date": pd.to_datetime(date_str),
-                    "open": float(daily["1. open"]),
-                    "high": float(daily["2. high"]),
-                    "low": float(daily["3. low"]),
-                    "close": float(daily["4. close"]),
-                    "volume": float(daily["5. volume"]),
-                }
-            )
-        except Exception:
-            continue
+    # One vectorized conversion per column instead of per-row parsing;
+    # rows with unparseable values are dropped as before.
+    df = (
+        pd.DataFrame.from_dict(ts, orient="index")
+        .rename(columns=_PRICE_COLUMNS)
+        .reindex(columns=list(_PRICE_COLUMNS.values()))
+        .apply(pd.to_numeric, errors="coerce")
+    )
+    df.index = pd.to_datetime(df.index, format="%Y-%m-%d", errors="coerce", cache=True)
+    df = df[df.index.notna()].dropna()
 
-    if not records:
+    if df.empty:
         raise ValueError("AlphaVantage returned empty or invalid data")
 
-    df = pd.DataFrame(records)
-    df.sort_values("date", inplace=True)
-    df.reset_index(drop=True, inplace=True)
+    return df.astype("float64").sort_index().rename_axis("date")
+
 
-    start = pd.to_datetime(start_date)
-    end = pd.to_datetime(end_date)
-    df = df[(df["date"] >= start) & (df["date"] <= end)].copy()
-    df.reset_index(drop=True, inplace=True)
+def _slice_prices(prices: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    # The index is sorted, so the window is two binary searches and one
+    # positional slice
+    lo = prices.index.searchsorted(pd.to_datetime(start_date), side="left")
+    hi = prices.index.searchsorted(pd.to_datetime(end_date), side="right")
+    df = prices.iloc[lo:hi].reset_index()
 
     if df.empty:
         raise ValueError("No data in specified date range. Try shortening the range to recent months or check dates.")
 
     return df
+
+
+@functools.lru_cache(maxsize=128)
+def _load_prices(symbol: str, output_size: str, day: str) -> pd.DataFrame:
+    """
+    Full (unsliced) price history for a symbol, from the in-process LRU, the
+    disk cache, or AlphaVantage, in that order. Every date window of the same
+    symbol shares this one frame; callers slice it.
+    """
+    prices = _cached_prices(symbol, output_size, day)
+    if prices is None:
+        resp = _SESSION.get(ALPHAVANTAGE_URL, params=_query_params(symbol, output_size), timeout=15)
+        if resp.status_code != 200:
+            raise ValueError(f"AlphaVantage request failed with HTTP status: {resp.status_code}")
+
+        prices = _parse_payload(orjson.loads(resp.content), output_size)
+        _CACHE.set(_cache_key(symbol, output_size, day), prices, expire=CACHE_EXPIRE_SECONDS)
+
+    return prices
+
+
+def fetch_price_history(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+) -> pd.DataFrame:
+    """
+    Fetch daily historical data from AlphaVantage (TIME_SERIES_DAILY; compact for
+    recent start dates, full history otherwise).
+    Returns DataFrame with columns: date, open, high, low, close, volume
+    Sorted by date and filtered by start_date/end_date.
+    """
+    _check_api_key()
+
+    # Keyed by day as well so a long-running process picks up new bars;
+    # slicing returns a new frame, so the cached history is never shared.
+    prices = _load_prices(symbol.upper(), _output_size(start_date), dt.date.today().isoformat())
+    return _slice_prices(prices, start_date, end_date)
+
+
+def fetch_price_histories(
+    symbols: List[str],
+    start_date: str,
+    end_date: str,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch daily historical data for several symbols in parallel threads
+    (requests releases the GIL while waiting on the network).
+    Returns {SYMBOL: DataFrame}, keyed by upper-cased symbol.
+    """
+    unique = list(dict.fromkeys(s.upper() for s in symbols))
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        frames = executor.map(lambda s: fetch_price_history(s, start_date, end_date), unique)
+        return dict(zip(unique, frames))
+
+
+async def _afetch(
+    session: "aiohttp.ClientSession",
+    semaphore: asyncio.Semaphore,
+    symbol: str,
+    start_date: str,
+    end_date: str,
+) -> pd.DataFrame:
+    day = dt.date.today().isoformat()
+    output_size = _output_size(start_date)
+    prices = _cached_prices(symbol, output_size, day)
+    if prices is None:
+        async with semaphore:
+            async with session.get(
+                ALPHAVANTAGE_URL,
+                params=_query_params(symbol, output_size),
+            ) as resp:
+                if resp.status != 200:
+                    raise ValueError(f"AlphaVantage request failed with HTTP status: {resp.status}")
+                body = await resp.read()
+        prices = _parse_payload(orjson.loads(body), output_size)
+        _CACHE.set(_cache_key(symbol, output_size, day), prices, expire=CACHE_EXPIRE_SECONDS)
+
+    return _slice_prices(prices, start_date, end_date)
+
+
+async def fetch_many(
+    symbols: List[str],
+    start_date: str,
+    end_date: str,
+) -> List[pd.DataFrame]:
+    """
+    Fetch daily historical data for several symbols concurrently.
+    Returns one DataFrame per symbol, in the same order as symbols.
+    """
+    _check_api_key()
+
+    # Only the batch path needs aiohttp; importing it lazily keeps it out of
+    # the Gradio/MCP cold start, which only uses the blocking fetch
+    import aiohttp
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    timeout = aiohttp.ClientTimeout(total=15)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        return await asyncio.gather(
+            *[_afetch(session, semaphore, s, start_date, end_date) for s in symbols]
+        )
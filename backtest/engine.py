@@ -1,8 +1,8 @@
 # backtest/engine.py
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-from .data import fetch_price_history
+from .data import fetch_price_histories, fetch_price_history
 from .strategies import run_strategy
 
 
@@ -26,6 +26,30 @@ def run_backtest(
     return res
 
 
+def run_backtests(
+    symbols: List[str],
+    start_date: str,
+    end_date: str,
+    strategy_config: Dict[str, Any],
+    initial_cash: float,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the same strategy over several symbols, fetching all price histories
+    concurrently first. Returns {SYMBOL: result}.
+    """
+    frames = fetch_price_histories(symbols, start_date, end_date)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for symbol, df in frames.items():
+        res = run_strategy(df, strategy_config, initial_cash)
+        res["symbol"] = symbol
+        res["start_date"] = start_date
+        res["end_date"] = end_date
+        res["strategy_config"] = strategy_config
+        results[symbol] = res
+    return results
+
+
 def run_backtest_for_symbol(
     symbol: str,
     start_date: str,
@@ -2,8 +2,11 @@
 
 from typing import Union
 
+import numpy as np
 import pandas as pd
 
+from ._kernels import metrics_kernel
+
 
 Number = Union[int, float]
 
@@ -14,10 +17,7 @@ def compute_max_drawdown(equity: pd.Series) -> float:
     """
     if equity.empty:
         return 0.0
-    running_max = equity.cummax()
-    drawdown = (equity - running_max) / running_max
-    max_dd = drawdown.min()
-    return abs(float(max_dd))
+    return float(metrics_kernel(np.ascontiguousarray(equity.to_numpy(dtype=np.float64)))[2])
 
 
 def annualized_return(equity: pd.Series) -> float:
@@ -26,11 +26,4 @@ def annualized_return(equity: pd.Series) -> float:
     """
     if equity.empty:
         return 0.0
-    if equity.iloc[0] == 0:
-        return 0.0
-    total_return = equity.iloc[-1] / equity.iloc[0] - 1.0
-    n_days = len(equity)
-    if n_days <= 1:
-        return float(total_return)
-    ann_ret = (1.0 + total_return) ** (252.0 / n_days) - 1.0
-    return float(ann_ret)
+    return float(metrics_kernel(np.ascontiguousarray(equity.to_numpy(dtype=np.float64)))[1])
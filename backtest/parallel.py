@@ -0,0 +1,73 @@
+# backtest/parallel.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from .data import MAX_CONCURRENT_REQUESTS, fetch_price_history
+from .engine import run_backtest
+
+
+def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    return run_backtest(
+        symbol=job["symbol"],
+        start_date=job["start_date"],
+        end_date=job["end_date"],
+        strategy_config=job["strategy_config"],
+        initial_cash=float(job["initial_cash"]),
+    )
+
+
+def _prefetch(jobs: List[Dict[str, Any]]) -> Dict[Tuple[str, str, str], Exception]:
+    """
+    Download every (symbol, window) once in the parent so workers only read
+    the disk cache. Returns the failures instead of raising on the first one.
+    """
+    windows = {(job["symbol"].upper(), job["start_date"], job["end_date"]) for job in jobs}
+    failures: Dict[Tuple[str, str, str], Exception] = {}
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        futures = {executor.submit(fetch_price_history, *window): window for window in windows}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failures[futures[future]] = e
+    return failures
+
+
+def run_many(
+    jobs: List[Dict[str, Any]],
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run many backtests (symbols x parameter grids) across processes.
+    Each job is a dict with: symbol, start_date, end_date, strategy_config,
+    initial_cash. Returns results in the same order as jobs; a job that
+    fails yields {"error": message, **job} instead of aborting the sweep.
+    """
+    if not jobs:
+        return []
+
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, MAX_CONCURRENT_REQUESTS)
+
+    failures = _prefetch(jobs)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for i, job in enumerate(jobs):
+            error = failures.get((job["symbol"].upper(), job["start_date"], job["end_date"]))
+            if error is not None:
+                # Its data could not be fetched; don't spend another request in a worker
+                results[i] = {"error": str(error), **job}
+            else:
+                futures[executor.submit(_run_job, job)] = i
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                results[i] = {"error": str(e), **jobs[i]}
+
+    return results
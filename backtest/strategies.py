@@ -1,24 +1,28 @@
 # backtest/strategies.py
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List
 
 import numpy as np
 import pandas as pd
 
-from .metrics import compute_max_drawdown, annualized_return
+from ._kernels import dca_kernel, ma_cross_kernel, metrics_kernel, move_mean
+
+
+def _format_dates(df: pd.DataFrame) -> List[str]:
+    """YYYY-MM-DD strings for every bar, formatted in one vectorized pass"""
+    return pd.DatetimeIndex(df["date"]).strftime("%Y-%m-%d").tolist()
 
 
 def _build_result(
-    equity_list: List[Tuple[pd.Timestamp, float]],
+    date_strs: List[str],
+    equity: np.ndarray,
     trades: List[Dict[str, Any]],
     initial_cash: float,
 ) -> Dict[str, Any]:
     """Common result builder with metrics calculation"""
-    equity_df = pd.DataFrame(equity_list, columns=["date", "equity"])
-
-    if equity_df.empty:
+    if not date_strs:
         return {
-            "equity_curve": [],
+            "equity_curve": {"date": [], "equity": []},
             "trades": [],
             "metrics": {
                 "initial_cash": float(initial_cash),
@@ -31,20 +35,17 @@ def _build_result(
             },
         }
 
-    # Calculate total return safely
-    if equity_df["equity"].iloc[0] == 0:
-        total_return = 0.0
-    else:
-        total_return = equity_df["equity"].iloc[-1] / equity_df["equity"].iloc[0] - 1.0
-    max_dd = compute_max_drawdown(equity_df["equity"])
-    ann_ret = annualized_return(equity_df["equity"])
+    equity = np.ascontiguousarray(equity, dtype=np.float64)
+
+    # Total return, annualized return and max drawdown in one fused pass
+    total_return, ann_ret, max_dd = metrics_kernel(equity)
 
     win_trades = [t for t in trades if t.get("pnl", 0.0) > 0]
     win_rate = len(win_trades) / len(trades) if trades else 0.0
 
     metrics = {
         "initial_cash": float(initial_cash),
-        "final_equity": float(equity_df["equity"].iloc[-1]),
+        "final_equity": float(equity[-1]),
         "total_return": float(total_return),
         "annualized_return": float(ann_ret),
         "max_drawdown": float(max_dd),
@@ -52,18 +53,26 @@ def _build_result(
         "win_rate": float(win_rate),
     }
 
-    equity_curve = [
-        {"date": d.strftime("%Y-%m-%d"), "equity": float(v)}
-        for d, v in equity_list
-    ]
-
+    # Columnar {"date": [...], "equity": [...]}; use equity_curve_aos() for rows
     return {
-        "equity_curve": equity_curve,
+        "equity_curve": {"date": date_strs, "equity": equity.tolist()},
         "trades": trades,
         "metrics": metrics,
     }
 
 
+def equity_curve_aos(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Row-oriented [{"date": ..., "equity": ...}, ...] view of a result's
+    columnar equity_curve, built on demand for callers that need rows.
+    """
+    curve = result["equity_curve"]
+    return [
+        {"date": d, "equity": v}
+        for d, v in zip(curve["date"], curve["equity"])
+    ]
+
+
 def run_ma_cross_strategy(
     df: pd.DataFrame,
     params: Dict[str, Any],
@@ -75,86 +84,63 @@ def run_ma_cross_strategy(
     - Sell when short MA crosses below long MA
     """
     if df.empty:
-        return _build_result([], [], initial_cash)
+        return _build_result([], np.empty(0), [], initial_cash)
     
     short_window = int(params.get("short_window", 20))
     long_window = int(params.get("long_window", 60))
 
+    # The MA kernel indexes arr[i - window] without bounds checks, so windows
+    # must be validated here before reaching it
+    if short_window < 1 or long_window < 1:
+        raise ValueError("short_window and long_window must be at least 1 in ma_cross strategy")
     if short_window >= long_window:
         raise ValueError("short_window must be less than long_window in ma_cross strategy")
 
-    prices = df["close"].copy()
+    # Read-only views of the columns; MAs go into fresh arrays, never onto df
+    date_strs = _format_dates(df)
+    close = np.ascontiguousarray(df["close"].to_numpy(dtype=np.float64))
+    ma_s = move_mean(close, short_window)
+    ma_l = move_mean(close, long_window)
+    n = len(close)
+
+    # Signed crossover events (+1 up, -1 down, 0 none) as pure arithmetic on
+    # one diff array; comparisons against NaN warm-up bars are False
+    diff = ma_s - ma_l
+    up = (diff[:-1] <= 0) & (diff[1:] > 0)
+    dn = (diff[:-1] >= 0) & (diff[1:] < 0)
+    event = np.zeros(n, dtype=np.int8)
+    event[1:] = up.view(np.int8) - dn.view(np.int8)
+
+    # Position (0/1) is the sign of the most recent event, forward-filled.
+    # event[0] is always 0, so bars before the first event gather a 0.
+    last_event = np.maximum.accumulate(np.where(event != 0, np.arange(n), 0))
+    position = event[last_event] > 0
+
+    # Cash/shares are path dependent, so the accounting runs in a JIT kernel.
+    # No event can fire until both MAs exist, so the warm-up is skipped.
+    warmup = long_window - 1
+    equity, entry_idx, exit_idx, trade_shares = ma_cross_kernel(
+        close, position, float(initial_cash), warmup
+    )
 
-    df_ma = df.copy()
-    df_ma["ma_short"] = prices.rolling(window=short_window).mean()
-    df_ma["ma_long"] = prices.rolling(window=long_window).mean()
-
-    cash = initial_cash
-    shares = 0.0
-    equity_list: List[Tuple[pd.Timestamp, float]] = []
     trades: List[Dict[str, Any]] = []
-
-    last_signal = 0  # 0: no position, 1: long position
-    entry_price = None
-    entry_date = None
-
-    for i in range(len(df_ma)):
-        date = df_ma.loc[i, "date"]
-        price = df_ma.loc[i, "close"]
-        ma_s = df_ma.loc[i, "ma_short"]
-        ma_l = df_ma.loc[i, "ma_long"]
-
-        if np.isnan(ma_s) or np.isnan(ma_l):
-            equity = cash + shares * price
-            equity_list.append((date, equity))
-            continue
-
-        if i == 0:
-            signal = 0
-        else:
-            prev_ma_s = df_ma.loc[i - 1, "ma_short"]
-            prev_ma_l = df_ma.loc[i - 1, "ma_long"]
-            signal = last_signal
-            if (prev_ma_s <= prev_ma_l) and (ma_s > ma_l):
-                signal = 1
-            elif (prev_ma_s >= prev_ma_l) and (ma_s < ma_l):
-                signal = 0
-
-        if signal == 1 and last_signal == 0:
-            if cash > 0:
-                shares = cash // price
-                cost = shares * price
-                cash -= cost
-                entry_price = price
-                entry_date = date
-
-        elif signal == 0 and last_signal == 1:
-            if shares > 0:
-                proceeds = shares * price
-                cash += proceeds
-                if entry_price is not None and entry_date is not None:
-                    pnl = proceeds - entry_price * shares
-                    trades.append(
-                        {
-                            "entry_date": entry_date.strftime("%Y-%m-%d"),
-                            "exit_date": date.strftime("%Y-%m-%d"),
-                            "entry_price": float(entry_price),
-                            "exit_price": float(price),
-                            "shares": float(shares),
-                            "pnl": float(pnl),
-                            "side": "long",
-                            "strategy": "ma_cross",
-                        }
-                    )
-                shares = 0.0
-                entry_price = None
-                entry_date = None
-
-        equity = cash + shares * price
-        equity_list.append((date, equity))
-        last_signal = signal
-
-    return _build_result(equity_list, trades, initial_cash)
+    for e, x, sh in zip(entry_idx.tolist(), exit_idx.tolist(), trade_shares.tolist()):
+        entry_price = close[e]
+        exit_price = close[x]
+        trades.append(
+            {
+                "entry_date": date_strs[e],
+                "exit_date": date_strs[x],
+                "entry_price": float(entry_price),
+                "exit_price": float(exit_price),
+                "shares": sh,
+                "pnl": float(sh * exit_price - entry_price * sh),
+                "side": "long",
+                "strategy": "ma_cross",
+            }
+        )
+
+    return _build_result(date_strs, equity, trades, initial_cash)
 
 
 def run_dca_strategy(
@@ -170,7 +156,7 @@ def run_dca_strategy(
     - No selling, calculate total return at end date
     """
     if df.empty:
-        return _build_result([], [], initial_cash)
+        return _build_result([], np.empty(0), [], initial_cash)
     
     interval_days = int(params.get("interval_days", 7))
     buy_amount = float(params.get("buy_amount", 1000.0))
@@ -180,72 +166,32 @@ def run_dca_strategy(
     if buy_amount <= 0:
         raise ValueError("buy_amount must be greater than 0 in dca strategy")
 
-    cash = initial_cash
-    shares = 0.0
-    equity_list: List[Tuple[pd.Timestamp, float]] = []
-    raw_trades: List[Dict[str, Any]] = []
-    total_invested = initial_cash  # Track total money invested
-
-    last_buy_date = None
-
-    for i in range(len(df)):
-        date = df.loc[i, "date"]
-        price = df.loc[i, "close"]
-
-        if price <= 0:
-            # Skip invalid prices
-            equity = cash + shares * price if shares > 0 else cash
-            equity_list.append((date, equity))
-            continue
-
-        should_buy = False
-        if last_buy_date is None:
-            # First buy on first trading day
-            should_buy = True
-        else:
-            # Calculate days since last buy (using calendar days, not trading days)
-            delta_days = (date - last_buy_date).days
-            if delta_days >= interval_days:
-                should_buy = True
-
-        # Execute buy if conditions are met
-        if should_buy:
-            # Add new funds for this investment period
-            cash += buy_amount
-            total_invested += buy_amount
-            
-            # Invest the buy_amount (or remaining cash if less)
-            invest = min(buy_amount, cash)
-            if invest > 0:
-                buy_shares = invest / price
-                shares += buy_shares
-                cash -= invest
-                last_buy_date = date
-                raw_trades.append(
-                    {
-                        "entry_date": date,
-                        "entry_price": float(price),
-                        "shares": float(buy_shares),
-                    }
-                )
-
-        # Calculate equity: remaining cash + value of shares at current price
-        equity = cash + shares * price
-        equity_list.append((date, equity))
+    date_strs = _format_dates(df)
+    days = df["date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    close = np.ascontiguousarray(df["close"].to_numpy(dtype=np.float64))
+
+    # Buy bars follow a fixed calendar schedule (calendar days, not trading
+    # days); each buy adds buy_amount of new funds and invests all of it,
+    # so cash stays at initial_cash and only the share count grows.
+    equity, buy_idx, buy_shares = dca_kernel(
+        close, days, interval_days, buy_amount, float(initial_cash)
+    )
+    total_invested = initial_cash + buy_amount * len(buy_idx)  # Track total money invested
 
     trades: List[Dict[str, Any]] = []
-    if raw_trades and len(df) > 0:
-        final_date = df["date"].iloc[-1]
-        final_price = float(df["close"].iloc[-1])
-        for t in raw_trades:
-            pnl = (final_price - t["entry_price"]) * t["shares"]
+    if len(buy_idx) > 0:
+        final_date = date_strs[-1]
+        final_price = float(close[-1])
+        for i, sh in zip(buy_idx.tolist(), buy_shares.tolist()):
+            entry_price = float(close[i])
+            pnl = (final_price - entry_price) * sh
             trades.append(
                 {
-                    "entry_date": t["entry_date"].strftime("%Y-%m-%d"),
-                    "exit_date": final_date.strftime("%Y-%m-%d"),
-                    "entry_price": float(t["entry_price"]),
-                    "exit_price": float(final_price),
-                    "shares": float(t["shares"]),
+                    "entry_date": date_strs[i],
+                    "exit_date": final_date,
+                    "entry_price": entry_price,
+                    "exit_price": final_price,
+                    "shares": float(sh),
                     "pnl": float(pnl),
                     "side": "long",
                     "strategy": "dca",
@@ -254,7 +200,7 @@ def run_dca_strategy(
 
     # Use total_invested as the initial cash for metrics calculation
     # This represents the total amount of money put into the strategy
-    return _build_result(equity_list, trades, total_invested)
+    return _build_result(date_strs, equity, trades, total_invested)
 
 
 def run_buy_and_hold_strategy(
@@ -268,33 +214,32 @@ def run_buy_and_hold_strategy(
     - No further trading, equity = shares * close_price
     """
     if df.empty:
-        return _build_result([], [], initial_cash)
+        return _build_result([], np.empty(0), [], initial_cash)
     
     buy_fraction = params.get("buy_fraction", 1.0)
 
-    first_price = df.iloc[0]["open"]
+    date_strs = _format_dates(df)
+    close = df["close"].to_numpy(dtype=np.float64)
+    first_price = float(df["open"].iat[0])
     cash_to_use = initial_cash * buy_fraction
 
     if first_price <= 0:
         raise ValueError("Invalid first price")
 
     shares = cash_to_use / first_price
-    entry_date = df.iloc[0]["date"]
-    entry_price = float(first_price)
-    final_date = df.iloc[-1]["date"]
-    final_price = float(df.iloc[-1]["close"])
+    entry_date = date_strs[0]
+    entry_price = first_price
+    final_date = date_strs[-1]
+    final_price = float(close[-1])
 
-    equity_list: List[Tuple[pd.Timestamp, float]] = []
-    for _, row in df.iterrows():
-        equity = shares * row["close"]
-        equity_list.append((row["date"], equity))
+    equity = shares * close
 
     trades: List[Dict[str, Any]] = []
     if len(df) > 0:
         pnl = (final_price - entry_price) * shares
         trades.append({
-            "entry_date": entry_date.strftime("%Y-%m-%d"),
-            "exit_date": final_date.strftime("%Y-%m-%d"),
+            "entry_date": entry_date,
+            "exit_date": final_date,
             "entry_price": entry_price,
             "exit_price": final_price,
             "shares": float(shares),
@@ -303,7 +248,7 @@ def run_buy_and_hold_strategy(
             "strategy": "buy_and_hold",
         })
 
-    return _build_result(equity_list, trades, initial_cash)
+    return _build_result(date_strs, equity, trades, initial_cash)
 
 
 def run_strategy(
@@ -1,45 +1,58 @@
 # llm_strategy.py
 
 import os
-import json
+import threading
+from collections import OrderedDict
 from typing import Any, Dict
 
+import diskcache
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+VALID_STRATEGY_TYPES = frozenset({"ma_cross", "dca", "buy_and_hold", "other"})
 
-def llm_generate_strategy_config(description: str) -> Dict[str, Any]:
-    """
-    Calls Modal HTTP endpoint to parse natural language strategy description into strategy_config.
-    Requires environment variable: MODAL_STRATEGY_URL
-    """
-    url = os.getenv("MODAL_STRATEGY_URL")
-    if not url:
-        raise RuntimeError("MODAL_STRATEGY_URL environment variable not set")
-
-    params = {"description": description}
+# Parsed configs for the same description are stable, so validated Modal
+# responses are kept on disk and shared by the app and MCP server processes
+CACHE_EXPIRE_SECONDS = 7 * 86400
+_CACHE = diskcache.Cache(os.path.expanduser("~/.cache/strategy"))
 
-    try:
-        resp = requests.get(url, params=params, timeout=30)
-    except Exception as e:
-        raise RuntimeError(f"Failed to call Modal endpoint: {e}")
+# In-process LRU of raw response bodies in front of the disk cache
+LOCAL_CACHE_SIZE = 256
+_local_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_LOCAL_LOCK = threading.Lock()
 
-    if resp.status_code != 200:
-        raise RuntimeError(
-            f"Modal endpoint returned non-200 status: {resp.status_code}, content: {resp.text[:500]}"
-        )
+# Reused keep-alive session so repeat parses skip the TCP/TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        # No read retries: a slow LLM call must not be re-sent (and re-billed)
+        max_retries=Retry(
+            total=3,
+            read=0,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
 
-    try:
-        data = resp.json()
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Modal response is not valid JSON: {e}\nContent: {resp.text[:500]}")
 
+def _to_strategy_config(data: Any) -> Dict[str, Any]:
+    """Validate a decoded Modal response and return the strategy_config dict."""
+    if not isinstance(data, dict):
+        raise ValueError(f"Modal response is not a JSON object: {data}")
     if "error" in data:
         raise ValueError(f"Modal parsing error: {data['error']}")
 
     stype = data.get("type")
     params = data.get("params")
 
-    if stype not in ("ma_cross", "dca", "buy_and_hold", "other"):
+    if stype not in VALID_STRATEGY_TYPES:
         raise ValueError(f"Invalid strategy type from Modal: {stype}")
     if not isinstance(params, dict):
         raise ValueError(f"Modal params is not a dict: {params}")
@@ -48,9 +61,72 @@ def llm_generate_strategy_config(description: str) -> Dict[str, Any]:
         "type": stype,
         "params": params,
     }
-    
+
     # Include initial_cash if present
     if "initial_cash" in data:
         result["initial_cash"] = data["initial_cash"]
-    
+
     return result
+
+
+def _request_strategy_json(url: str, description: str) -> bytes:
+    """Raw JSON body of a validated Modal response; raises on any failure."""
+    try:
+        resp = _SESSION.get(url, params={"description": description}, timeout=30)
+    except Exception as e:
+        raise RuntimeError(f"Failed to call Modal endpoint: {e}")
+
+    if resp.status_code != 200:
+        raise RuntimeError(
+            f"Modal endpoint returned non-200 status: {resp.status_code}, content: {resp.text[:500]}"
+        )
+
+    try:
+        data = orjson.loads(resp.content)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"Modal response is not valid JSON: {e}\nContent: {resp.text[:500]}")
+
+    _to_strategy_config(data)
+    return resp.content
+
+
+def _fetch_strategy_json(url: str, description: str) -> bytes:
+    """
+    Raw JSON body for a description, from the in-process LRU, the disk cache,
+    or the endpoint, in that order. Entries are keyed on the case- and
+    whitespace-normalized text, but Modal always receives the description as
+    written. Failed or invalid responses raise and are never cached.
+    """
+    normalized = " ".join(description.lower().split())
+    key = f"strategy:{url}:{normalized}"
+
+    with _LOCAL_LOCK:
+        content = _local_cache.get(key)
+        if content is not None:
+            _local_cache.move_to_end(key)
+            return content
+
+    content = _CACHE.get(key)
+    if content is None:
+        content = _request_strategy_json(url, description)
+        _CACHE.set(key, content, expire=CACHE_EXPIRE_SECONDS)
+
+    with _LOCAL_LOCK:
+        _local_cache[key] = content
+        if len(_local_cache) > LOCAL_CACHE_SIZE:
+            _local_cache.popitem(last=False)
+    return content
+
+
+def llm_generate_strategy_config(description: str) -> Dict[str, Any]:
+    """
+    Calls Modal HTTP endpoint to parse natural language strategy description into strategy_config.
+    Descriptions that differ only in case or whitespace share one cached result.
+    Requires environment variable: MODAL_STRATEGY_URL
+    """
+    url = os.getenv("MODAL_STRATEGY_URL")
+    if not url:
+        raise RuntimeError("MODAL_STRATEGY_URL environment variable not set")
+
+    # Decoding per call hands every caller its own dict to mutate
+    return _to_strategy_config(orjson.loads(_fetch_strategy_json(url, description.strip())))
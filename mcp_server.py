@@ -3,20 +3,23 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 from mcp.server.fastmcp import FastMCP
 
 from backtest import run_backtest
+from backtest.data import MAX_CONCURRENT_REQUESTS
 from llm_strategy import llm_generate_strategy_config
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParseStrategyResult:
     ok: bool
     strategy_config: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BacktestSummary:
     symbol: str
     start_date: str
@@ -24,14 +27,17 @@ class BacktestSummary:
     strategy_config: Dict[str, Any]
     metrics: Dict[str, Any]
     trades_sample: List[Any]
-    equity_sample: List[Any]
+    equity_sample: Dict[str, List[Any]]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BacktestResult:
     ok: bool
     result: Optional[BacktestSummary] = None
     error: Optional[str] = None
 
+TRADES_SAMPLE_SIZE = 10
+EQUITY_SAMPLE_SIZE = 50
+
 mcp = FastMCP("stock-backtest-mcp", json_response=True)
 
 @mcp.tool()
@@ -45,13 +51,12 @@ def parse_strategy(description: str) -> ParseStrategyResult:
     except Exception as e:
         return ParseStrategyResult(ok=False, error=f"parse_strategy failed: {e}")
 
-@mcp.tool()
-def run_backtest_tool(
+def _backtest_summary(
     symbol: str,
     start_date: str,
     end_date: str,
     strategy_config: Dict[str, Any],
-    initial_cash: float = 10000.0,
+    initial_cash: float,
 ) -> BacktestResult:
     symbol = (symbol or "").strip()
     if not symbol:
@@ -68,7 +73,7 @@ def run_backtest_tool(
         return BacktestResult(ok=False, error=f"run_backtest failed: {e}")
 
     trades = result.get("trades", [])
-    equity_curve = result.get("equity_curve", [])
+    equity_curve = result.get("equity_curve") or {"date": [], "equity": []}
 
     summary = BacktestSummary(
         symbol=result.get("symbol"),
@@ -76,11 +81,42 @@ def run_backtest_tool(
         end_date=result.get("end_date"),
         strategy_config=result.get("strategy_config"),
         metrics=result.get("metrics"),
-        trades_sample=trades[:10],
-        equity_sample=equity_curve[:50],
+        trades_sample=list(itertools.islice(trades, TRADES_SAMPLE_SIZE)),
+        equity_sample={
+            col: list(itertools.islice(equity_curve[col], EQUITY_SAMPLE_SIZE))
+            for col in ("date", "equity")
+        },
     )
 
     return BacktestResult(ok=True, result=summary)
 
+@mcp.tool()
+def run_backtest_tool(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    strategy_config: Dict[str, Any],
+    initial_cash: float = 10000.0,
+) -> BacktestResult:
+    return _backtest_summary(symbol, start_date, end_date, strategy_config, initial_cash)
+
+@mcp.tool()
+def run_backtest_batch(
+    symbols: List[str],
+    start_date: str,
+    end_date: str,
+    strategy_config: Dict[str, Any],
+    initial_cash: float = 10000.0,
+) -> List[BacktestResult]:
+    """Backtest one strategy on several symbols concurrently; one result per symbol, in order."""
+    if not symbols:
+        return []
+    # Capped like the data layer's own fetch pool to stay within AlphaVantage limits
+    with ThreadPoolExecutor(max_workers=min(len(symbols), MAX_CONCURRENT_REQUESTS)) as executor:
+        return list(executor.map(
+            lambda s: _backtest_summary(s, start_date, end_date, strategy_config, initial_cash),
+            symbols,
+        ))
+
 if __name__ == "__main__":
     mcp.run()
@@ -1,17 +1,21 @@
 import os
-import json
-from typing import Dict, Any
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional
 
+import httpx
 import modal
-from openai import OpenAI
+from openai import AsyncOpenAI
+from pydantic_core import SchemaValidator, ValidationError, from_json
 
 # --- Image & secrets setup ----------------------------------------------------
 
-# 1) Image with FastAPI + OpenAI client installed
+# 1) Image with FastAPI + OpenAI client installed, plus the uvloop event loop
+#    and httptools HTTP parser for the async endpoint
 image = (
     modal.Image.debian_slim()
-    .pip_install("fastapi[standard]")
-    .pip_install("openai")
+    .pip_install("fastapi[standard]", "openai", "uvloop", "httptools")
 )
 
 # 2) Secret that provides OPENAI_API_KEY as an env var inside the container.
@@ -27,37 +31,25 @@ app = modal.App(
 )
 
 
-# --- LLM-based parser ---------------------------------------------------------
+# 4) Parsed configs shared by every container, keyed by description hash
+strategy_cache = modal.Dict.from_name("strategy-config-cache", create_if_missing=True)
 
-def llm_strategy_from_description(description: str) -> Dict[str, Any]:
-    """
-    Call OpenAI GPT to convert a natural-language description into a
-    structured strategy_config JSON:
 
-        {
-          "type": "ma_cross" | "dca" | "buy_and_hold" | "other",
-          "params": { ... },
-          "initial_cash": number (optional)
-        }
-    """
-
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY is not set in environment.")
-
-    client = OpenAI(api_key=api_key)
+# --- LLM-based parser ---------------------------------------------------------
 
-    prompt = f"""You are a trading strategy parser. Analyze the user's description and determine the best matching strategy type.
+# Static instructions live in the system message, built once at import, so
+# every request sends an identical prefix that OpenAI's prompt cache can reuse
+SYSTEM_PROMPT = """You are a trading strategy parser. Analyze the user's description and determine the best matching strategy type.
 
 Convert the user's natural-language description into a JSON object with this EXACT schema:
 
-{{
+{
   "type": "ma_cross" | "dca" | "buy_and_hold" | "other",
-  "params": {{
+  "params": {
     // strategy-specific parameters (see below)
-  }},
+  },
   "initial_cash": number (optional, only include if mentioned in description)
-}}
+}
 
 Supported strategy types:
 
@@ -92,7 +84,7 @@ Supported strategy types:
 
 4) "other"
    - Use when: The description does not clearly match any of the above strategies
-   - params: {{}} (empty object)
+   - params: {} (empty object)
    - Examples:
        * "Sell when price drops 10%"
        * "Buy on RSI oversold, sell on RSI overbought"
@@ -107,18 +99,95 @@ Requirements:
 - Extract all relevant parameters from the description.
 - Use reasonable defaults if parameters are partially mentioned (e.g., if only one MA window mentioned, infer the other).
 - Extract initial_cash if mentioned.
-- Output ONLY valid JSON. No explanations, no markdown fences, no comments.
+- Output ONLY valid JSON. No explanations, no markdown fences, no comments."""
+
+
+# Parses and validates the model's JSON in one pydantic-core call. Unknown
+# keys are dropped; initial_cash is only present when the model returned it.
+_STRATEGY_VALIDATOR = SchemaValidator({
+    "type": "typed-dict",
+    "fields": {
+        "type": {
+            "type": "typed-dict-field",
+            "schema": {"type": "literal", "expected": ["ma_cross", "dca", "buy_and_hold", "other"]},
+        },
+        "params": {
+            "type": "typed-dict-field",
+            "schema": {
+                "type": "default",
+                "schema": {"type": "dict", "keys_schema": {"type": "str"}},
+                "default_factory": dict,
+            },
+        },
+        "initial_cash": {
+            "type": "typed-dict-field",
+            "schema": {"type": "float"},
+            "required": False,
+        },
+    },
+})
+
+def _is_complete_json(text: str) -> bool:
+    try:
+        from_json(text)
+    except ValueError:
+        return False
+    return True
+
+
+# The OpenAI SDK logs each backoff ("Retrying request to ...") at INFO;
+# surface those in the Modal logs so operators can see retries engage
+_openai_log = logging.getLogger("openai")
+_openai_log.setLevel(logging.INFO)
+_openai_log.addHandler(logging.StreamHandler())
+
+_client: Optional[AsyncOpenAI] = None
+
+
+def _get_client() -> AsyncOpenAI:
+    """One AsyncOpenAI client per container, so its connection pool is reused."""
+    global _client
+    if _client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY is not set in environment.")
+        # Rate limits (429), 5xx, timeouts and connection errors are retried by
+        # the SDK with jittered exponential backoff
+        _client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=3,
+            timeout=30.0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            ),
+        )
+    return _client
+
+
+async def llm_strategy_from_description(description: str) -> Dict[str, Any]:
+    """
+    Call OpenAI GPT to convert a natural-language description into a
+    structured strategy_config JSON:
+
+        {
+          "type": "ma_cross" | "dca" | "buy_and_hold" | "other",
+          "params": { ... },
+          "initial_cash": number (optional)
+        }
+    """
+
+    client = _get_client()
 
-User description:
-\"\"\"{description}\"\"\"
-    """.strip()
+    prompt = f'User description:\n"""{description}"""'
 
-    response = client.chat.completions.create(
+    # Output is a single small JSON object, so stream it and stop reading as
+    # soon as the object is complete instead of waiting for the end of stream
+    stream = await client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[
             {
                 "role": "system",
-                "content": "You are a trading strategy parser. Always return valid JSON only, no other text."
+                "content": SYSTEM_PROMPT,
             },
             {
                 "role": "user",
@@ -126,33 +195,76 @@ User description:
             }
         ],
         temperature=0.1,
-        max_tokens=500,
-        response_format={"type": "json_object"}
+        max_tokens=200,
+        response_format={"type": "json_object"},
+        stream=True,
     )
 
-    text = response.choices[0].message.content.strip()
+    parts = []
+    async with stream:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            parts.append(delta)
+            if delta.rstrip().endswith("}") and _is_complete_json("".join(parts)):
+                break
+
+    text = "".join(parts).strip()
 
     try:
-        data = json.loads(text)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"LLM returned invalid JSON: {e}\nRaw text: {text}")
+        return _STRATEGY_VALIDATOR.validate_json(text)
+    except ValidationError as e:
+        raise ValueError(f"LLM returned invalid strategy JSON: {e}\nRaw text: {text}")
+
+
+# --- Parse cache --------------------------------------------------------------
 
-    stype = data.get("type")
-    params = data.get("params", {})
+LOCAL_CACHE_SIZE = 1024
 
-    if stype not in ("ma_cross", "dca", "buy_and_hold", "other"):
-        raise ValueError(f"Invalid strategy type from LLM: {stype}")
-    if not isinstance(params, dict):
-        raise ValueError("params must be a JSON object")
+# Per-container LRU in front of the shared modal.Dict
+_local_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
-    return data
+
+def _cache_key(description: str) -> str:
+    normalized = " ".join(description.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+async def cached_strategy_from_description(description: str) -> Dict[str, Any]:
+    """
+    llm_strategy_from_description with a two-level cache (container LRU, then
+    the shared modal.Dict). Descriptions differing only in case or whitespace
+    share an entry; failed parses raise and are not cached.
+    """
+    key = _cache_key(description)
+
+    cfg = _local_cache.get(key)
+    if cfg is not None:
+        _local_cache.move_to_end(key)
+        return cfg
+
+    cfg = await strategy_cache.get.aio(key)
+    if cfg is None:
+        cfg = await llm_strategy_from_description(description)
+        await strategy_cache.put.aio(key, cfg)
+
+    _local_cache[key] = cfg
+    if len(_local_cache) > LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+    return cfg
 
 
 # --- FastAPI endpoint exposed via Modal ---------------------------------------
 
+# The handler only awaits OpenAI, so one container serves many requests at
+# once by overlapping their round trips on the event loop.
 @app.function(secrets=[openai_secret])
+@modal.concurrent(max_inputs=32)
 @modal.fastapi_endpoint()
-def strategy_config_web(description: str = "") -> Dict[str, Any]:
+async def strategy_config_web(description: str = "") -> Dict[str, Any]:
     """
     GET endpoint:
     - Called as:  GET ?description=...
@@ -163,7 +275,7 @@ def strategy_config_web(description: str = "") -> Dict[str, Any]:
         return {"error": "description is required"}
 
     try:
-        cfg = llm_strategy_from_description(description)
+        cfg = await cached_strategy_from_description(description)
     except Exception as e:
         # Return error as JSON so the caller (llm_strategy.py) can show it nicely
         return {"error": f"LLM error: {e}"}
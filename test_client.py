@@ -1,24 +1,42 @@
 # test_client_fixed.py
-import sys, json, subprocess, time
+import sys, os, selectors, subprocess, time
+
+import orjson
 
 def start_server():
     return subprocess.Popen([sys.executable, "mcp_server.py"],
         stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE, text=True, bufsize=1)
+        stderr=subprocess.PIPE, bufsize=0)
 
 def send(proc, obj):
-    proc.stdin.write(json.dumps(obj) + "\n")
+    proc.stdin.write(orjson.dumps(obj) + b"\n")
     proc.stdin.flush()
 
-def recv(proc):
-    line = proc.stdout.readline()
-    if not line:
-        return None
-    return json.loads(line)
+def recv_many(proc, count, timeout=10.0):
+    """Drain up to `count` JSON-RPC messages, giving up after `timeout` seconds."""
+    fd = proc.stdout.fileno()
+    sel = selectors.DefaultSelector()
+    sel.register(fd, selectors.EVENT_READ)
+    deadline = time.monotonic() + timeout
+    buf = b""
+    messages = []
+    try:
+        while len(messages) < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not sel.select(remaining):
+                break
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            *lines, buf = (buf + chunk).split(b"\n")
+            messages.extend(orjson.loads(line) for line in lines if line.strip())
+    finally:
+        sel.close()
+    return messages
 
 if __name__ == "__main__":
+    # No startup sleep: requests queue in the stdin pipe until the server reads them
     proc = start_server()
-    time.sleep(1)
 
     # 1. initialize
     req = {
@@ -40,19 +58,23 @@ if __name__ == "__main__":
         }
       }
     }
-    print("Initializing...")
-    send(proc, req)
-    print("Init response:", recv(proc))
-
-    # 2. list tools
+    # 2. initialized notification (no response), then list tools
+    notif = {
+      "jsonrpc": "2.0",
+      "method": "notifications/initialized"
+    }
     req2 = {
       "jsonrpc": "2.0",
       "id": 2,
       "method": "tools/list",
       "params": {}
     }
-    print("Listing tools...")
-    send(proc, req2)
-    print("List response:", recv(proc))
+    # Pipeline all requests, then drain the responses
+    print("Initializing and listing tools...")
+    for obj in (req, notif, req2):
+        send(proc, obj)
+    responses = {msg.get("id"): msg for msg in recv_many(proc, 2)}
+    print("Init response:", responses.get(1))
+    print("List response:", responses.get(2))
 
     # Then you can call tool if you like...
@@ -0,0 +1,99 @@
+import asyncio
+import importlib
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+def _passthrough_decorator(*args, **kwargs):
+    return lambda fn: fn
+
+
+def _stub_modules():
+    """Minimal modal / openai / httpx stand-ins so modal_app imports locally."""
+    modal = types.ModuleType("modal")
+    image = mock.MagicMock()
+    image.pip_install.return_value = image
+    modal.Image = mock.MagicMock(debian_slim=mock.MagicMock(return_value=image))
+    modal.Secret = mock.MagicMock()
+    modal.Dict = mock.MagicMock()
+    modal.App = mock.MagicMock(return_value=mock.MagicMock(function=_passthrough_decorator))
+    modal.concurrent = _passthrough_decorator
+    modal.fastapi_endpoint = _passthrough_decorator
+
+    openai = types.ModuleType("openai")
+    openai.AsyncOpenAI = mock.MagicMock()
+
+    httpx = types.ModuleType("httpx")
+    httpx.AsyncClient = mock.MagicMock()
+    httpx.Limits = mock.MagicMock()
+
+    return {"modal": modal, "openai": openai, "httpx": httpx}
+
+
+class _AioMethod:
+    def __init__(self, fn):
+        self.aio = fn
+
+
+class _FakeModalDict:
+    def __init__(self):
+        self.data = {}
+        self.puts = 0
+
+        async def get(key):
+            return self.data.get(key)
+
+        async def put(key, value):
+            self.puts += 1
+            self.data[key] = value
+
+        self.get = _AioMethod(get)
+        self.put = _AioMethod(put)
+
+
+class CachedStrategyTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(sys.modules, _stub_modules()):
+            sys.modules.pop("modal_app", None)
+            self.modal_app = importlib.import_module("modal_app")
+        self.addCleanup(sys.modules.pop, "modal_app", None)
+
+        self.shared = _FakeModalDict()
+        self.calls = []
+
+        async def fake_llm(description):
+            self.calls.append(description)
+            return {"type": "buy_and_hold", "params": {"buy_fraction": 1.0}}
+
+        patcher_cache = mock.patch.object(self.modal_app, "strategy_cache", self.shared)
+        patcher_llm = mock.patch.object(self.modal_app, "llm_strategy_from_description", fake_llm)
+        for p in (patcher_cache, patcher_llm):
+            p.start()
+            self.addCleanup(p.stop)
+        self.modal_app._local_cache.clear()
+
+    def test_miss_calls_llm_and_stores_then_hits(self):
+        cfg = asyncio.run(self.modal_app.strategy_config_web("Buy and hold"))
+        self.assertEqual(cfg["type"], "buy_and_hold")
+        self.assertEqual(self.calls, ["Buy and hold"])
+        self.assertEqual(self.shared.puts, 1)
+
+        # Same description modulo case/whitespace: served from the container LRU
+        again = asyncio.run(self.modal_app.strategy_config_web("  buy AND   hold "))
+        self.assertEqual(again, cfg)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.shared.puts, 1)
+
+    def test_shared_cache_hit_skips_llm(self):
+        asyncio.run(self.modal_app.strategy_config_web("buy and hold"))
+        self.modal_app._local_cache.clear()
+
+        asyncio.run(self.modal_app.strategy_config_web("buy and hold"))
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.shared.puts, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backtest.strategies import run_strategy
+
+
+def _prices(n=30):
+    close = 100.0 + np.arange(n, dtype=np.float64)
+    return pd.DataFrame({
+        "date": pd.bdate_range("2024-01-01", periods=n),
+        "open": close,
+        "close": close,
+    })
+
+
+class MaCrossWindowTest(unittest.TestCase):
+    def _run(self, short_window, long_window):
+        return run_strategy(
+            _prices(),
+            {"type": "ma_cross", "params": {"short_window": short_window, "long_window": long_window}},
+        )
+
+    def test_rejects_zero_and_negative_windows(self):
+        for short_window, long_window in [(0, 10), (-5, 10), (-100000000, 10), (-10, -5)]:
+            with self.subTest(short_window=short_window, long_window=long_window):
+                with self.assertRaises(ValueError):
+                    self._run(short_window, long_window)
+
+    def test_valid_windows_run(self):
+        result = self._run(1, 5)
+        self.assertEqual(len(result["equity_curve"]["equity"]), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()